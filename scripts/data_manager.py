@@ -3,6 +3,7 @@ import pandas as pd
 import numpy as np
 import yfinance as yf
 from datetime import date
+from analytics import update_ticker_analytics
 
 # Define the data directory relative to this file's location
 DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'data')
@@ -31,6 +32,9 @@ def fetch_and_save_ticker_data(ticker_symbol: str) -> bool:
         file_path = os.path.join(DATA_DIR, f"{ticker_symbol}.csv")
         data.to_csv(file_path)
 
+        # Full download replaces the history, so rebuild the analytics from scratch
+        update_ticker_analytics(ticker_symbol, data, DATA_DIR, rebuild=True)
+
         print(f"Data Manager: Successfully saved data for {ticker_symbol}.")
         return True
 
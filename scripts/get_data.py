@@ -5,6 +5,7 @@ import pandas as pd
 import numpy as np
 import yfinance as yf
 from data_manager import fetch_and_save_ticker_data
+from analytics import update_ticker_analytics
 
 # --- Configuration ---
 DATA_DIR = os.path.join('..', 'data')
@@ -71,6 +72,9 @@ def update_existing_data(ticker, csv_path):
     combined_df.to_csv(csv_path)
     print(f"Successfully updated data for {ticker}.")
 
+    # Fold only the rows past the stored watermark into the running statistics
+    update_ticker_analytics(ticker, combined_df, DATA_DIR)
+
 
 def process_all_tickers():
     """
@@ -0,0 +1,208 @@
+import os
+import json
+import math
+from collections import deque
+
+import pandas as pd
+
+# Analytics live next to the price CSVs, one JSON file per ticker.
+ANALYTICS_SUBDIR = 'analytics'
+RETURN_WINDOWS = (7, 30, 90)
+VOLATILITY_WINDOW = 30
+TRADING_DAYS_PER_YEAR = 365  # Crypto trades every day
+
+
+class RunningAnalytics:
+    """
+    Streaming accumulator for per-ticker statistics. Each close is folded in
+    with push() in O(1), so a refresh only costs O(new rows).
+    """
+
+    def __init__(self):
+        self.count = 0          # Number of log returns seen
+        self.mean = 0.0         # Welford running mean of log returns
+        self.m2 = 0.0           # Welford sum of squared deviations
+        self.prev_close = None
+        self.peak = None
+        self.max_drawdown = 0.0
+        self.closes = deque(maxlen=max(RETURN_WINDOWS) + 1)
+        self.returns = deque(maxlen=VOLATILITY_WINDOW)
+        self.window_sum = 0.0
+        self.window_sumsq = 0.0
+
+    def push(self, close):
+        """
+        Folds a single close price into the running statistics.
+        """
+        close = float(close)
+        if math.isnan(close) or close <= 0:
+            return
+
+        if self.prev_close is not None:
+            r = math.log(close / self.prev_close)
+
+            # Welford's online mean/variance update
+            self.count += 1
+            delta = r - self.mean
+            self.mean += delta / self.count
+            self.m2 += delta * (r - self.mean)
+
+            # Rolling window sums; evict the oldest return once the window is full
+            if len(self.returns) == self.returns.maxlen:
+                old = self.returns[0]
+                self.window_sum -= old
+                self.window_sumsq -= old * old
+            self.returns.append(r)
+            self.window_sum += r
+            self.window_sumsq += r * r
+
+        self.peak = close if self.peak is None else max(self.peak, close)
+        self.max_drawdown = min(self.max_drawdown, close / self.peak - 1)
+        self.closes.append(close)
+        self.prev_close = close
+
+    def summary(self):
+        """
+        Returns the current statistics as a flat dictionary of plain floats.
+        """
+        stats = {
+            'last_close': self.prev_close,
+            'observations': self.count,
+            'mean_log_return': self.mean if self.count else None,
+            'volatility_annualized': None,
+            f'volatility_{VOLATILITY_WINDOW}d': None,
+            'max_drawdown': self.max_drawdown if self.peak is not None else None,
+            'current_drawdown': None,
+            'all_time_high': self.peak,
+        }
+        if self.count > 1:
+            stats['volatility_annualized'] = math.sqrt(self.m2 / (self.count - 1) * TRADING_DAYS_PER_YEAR)
+        n = len(self.returns)
+        if n > 1:
+            var = (self.window_sumsq - self.window_sum * self.window_sum / n) / (n - 1)
+            stats[f'volatility_{VOLATILITY_WINDOW}d'] = math.sqrt(max(var, 0.0) * TRADING_DAYS_PER_YEAR)
+        if self.peak is not None:
+            stats['current_drawdown'] = self.prev_close / self.peak - 1
+        for days in RETURN_WINDOWS:
+            key = f'return_{days}d'
+            stats[key] = self.closes[-1] / self.closes[-1 - days] - 1 if len(self.closes) > days else None
+        return stats
+
+    def to_dict(self):
+        return {
+            'count': self.count,
+            'mean': self.mean,
+            'm2': self.m2,
+            'prev_close': self.prev_close,
+            'peak': self.peak,
+            'max_drawdown': self.max_drawdown,
+            'closes': list(self.closes),
+            'returns': list(self.returns),
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        acc = cls()
+        acc.count = state['count']
+        acc.mean = state['mean']
+        acc.m2 = state['m2']
+        acc.prev_close = state['prev_close']
+        acc.peak = state['peak']
+        acc.max_drawdown = state['max_drawdown']
+        acc.closes.extend(state['closes'])
+        acc.returns.extend(state['returns'])
+        # Re-derive the window sums from the stored window to avoid carrying float drift
+        acc.window_sum = sum(acc.returns)
+        acc.window_sumsq = sum(r * r for r in acc.returns)
+        return acc
+
+
+def _analytics_path(data_dir, ticker_symbol):
+    return os.path.join(data_dir, ANALYTICS_SUBDIR, f"{ticker_symbol}.json")
+
+
+def _close_series(df):
+    """
+    Extracts a clean, date-sorted close price Series from a price DataFrame.
+    """
+    close = df['Close']
+    if isinstance(close, pd.DataFrame):  # Multi-level headers read back from CSV
+        close = close.iloc[:, 0]
+    close = pd.to_numeric(close, errors='coerce').dropna()
+    close.index = pd.to_datetime(close.index)
+    return close.sort_index()
+
+
+def update_ticker_analytics(ticker_symbol: str, df: pd.DataFrame, data_dir: str, rebuild: bool = False) -> bool:
+    """
+    Incrementally updates the stored analytics for a ticker from its price data.
+
+    The persisted state covers every row up to the watermark (the second-to-last
+    date). The latest row is only applied on a copy for the published stats,
+    because the data refresh overwrites the last known day with revised values.
+    Returns True on success, False on failure.
+    """
+    try:
+        close = _close_series(df)
+        if close.empty:
+            raise ValueError("No close prices available.")
+
+        path = _analytics_path(data_dir, ticker_symbol)
+        acc, watermark = RunningAnalytics(), None
+        if not rebuild and os.path.exists(path):
+            with open(path, 'r') as f:
+                stored = json.load(f)
+            stored_watermark = pd.to_datetime(stored['watermark'])
+            # Only resume if the history we built on is still present
+            if stored_watermark in close.index:
+                acc = RunningAnalytics.from_dict(stored['state'])
+                watermark = stored_watermark
+
+        new_rows = close if watermark is None else close[close.index > watermark]
+        if new_rows.empty:
+            return True
+
+        for value in new_rows.iloc[:-1]:
+            acc.push(value)
+        if len(new_rows) > 1:
+            watermark = new_rows.index[-2]
+
+        published = RunningAnalytics.from_dict(acc.to_dict())
+        published.push(new_rows.iloc[-1])
+
+        stats = published.summary()
+        stats['ticker'] = ticker_symbol
+        stats['last_date'] = new_rows.index[-1].strftime('%Y-%m-%d')
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump({
+                'watermark': watermark.strftime('%Y-%m-%d') if watermark is not None else None,
+                'state': acc.to_dict(),
+                'stats': stats,
+            }, f)
+        return True
+
+    except Exception as e:
+        print(f"Analytics: Error updating analytics for {ticker_symbol}. Reason: {e}")
+        return False
+
+
+def load_all_analytics(data_dir: str) -> pd.DataFrame:
+    """
+    Loads the published stats for every ticker into a single DataFrame.
+    """
+    analytics_dir = os.path.join(data_dir, ANALYTICS_SUBDIR)
+    if not os.path.exists(analytics_dir):
+        return pd.DataFrame()
+
+    rows = []
+    for file_name in sorted(os.listdir(analytics_dir)):
+        if not file_name.endswith('.json'):
+            continue
+        try:
+            with open(os.path.join(analytics_dir, file_name), 'r') as f:
+                rows.append(json.load(f)['stats'])
+        except (json.JSONDecodeError, KeyError, OSError):
+            continue
+    return pd.DataFrame(rows)
@@ -6,9 +6,13 @@ import pandas as pd
 import numpy as np
 from shiny import App, render, ui, reactive, req, Session
 import plotly.graph_objects as go
+from scipy.cluster.hierarchy import linkage, leaves_list
+from scipy.spatial.distance import squareform
 import requests
 from datetime import timedelta, date
 from data_manager import fetch_and_save_ticker_data
+from analytics import load_all_analytics
+from render_cache import RenderCache, data_watermark
 
 
 # --- Helper Function to Get Available Tickers ---
@@ -27,10 +31,34 @@ def get_available_tickers():
         return []
 
 
+# --- Helper Function to Order a Correlation Matrix ---
+def cluster_order(corr_matrix):
+    """
+    Returns the tickers reordered by average-linkage hierarchical clustering,
+    so that strongly correlated coins sit next to each other in the heatmap.
+    """
+    if len(corr_matrix) < 3:
+        return list(corr_matrix.index)
+    # Pairs without overlapping data are treated as uncorrelated
+    distance = 1 - corr_matrix.fillna(0).to_numpy()
+    np.fill_diagonal(distance, 0)
+    distance = np.clip((distance + distance.T) / 2, 0, 2)
+    order = leaves_list(linkage(squareform(distance, checks=False), method='average'))
+    return [corr_matrix.index[i] for i in order]
+
+
 # Define global file path for tickers JSON correctly
 _app_script_dir_global = os.path.dirname(os.path.abspath(__file__))
 _project_root_dir_global = os.path.dirname(_app_script_dir_global)
 TICKERS_FILE = os.path.join(_project_root_dir_global, 'data', 'crypto_tickers.json')
+DATA_DIR = os.path.join(_app_script_dir_global, 'data')
+
+# Rendered figures are shared across all sessions, keyed by view and data version
+render_cache = RenderCache()
+
+# Cell values are drawn only for small matrices; tick labels are hidden once they would overlap
+HEATMAP_LABEL_MAX_TICKERS = 20
+HEATMAP_TICK_MAX_TICKERS = 120
 
 # --- Shiny App UI ---
 app_ui = ui.page_navbar(
@@ -71,9 +99,16 @@ app_ui = ui.page_navbar(
                              choices={"7D": "Last 7 Days", "30D": "Last 30 Days", "90D": "Last 90 Days"},
                              selected="30D",
                          ),
+                         ui.input_checkbox("corr_cluster", "Group similar coins (clustering)", value=True),
                      ),
-                     ui.output_plot("correlation_heatmap"),
+                     ui.output_ui("correlation_heatmap"),
+                 ),
                  ),
+    ui.nav_panel("Screener",
+                 ui.h4("Ticker Screener"),
+                 ui.p("Precomputed statistics, refreshed with each data update. Click a column header to sort.",
+                      class_="text-muted"),
+                 ui.output_data_frame("screener_table"),
                  ),
     title="CryptoViz Dashboard",
 )
@@ -145,32 +180,42 @@ def server(input, output, session: Session):
         if df.empty:  # Replaced req(not df.empty) for explicit UI feedback
             return ui.p("Data not available for the selected ticker.", style="color: orange;")
 
-        fig = go.Figure()
-        fig.add_trace(
-            go.Scatter(x=df['Date'], y=df['Close'], mode='lines', name='Close Price', line=dict(color='#007bff')))
+        ticker = input.forecast_crypto_select()
         result = forecast_result()
+        forecast_key = None
         if result and "predicted_price" in result:
-            last_date = df['Date'].iloc[-1]
-            forecast_date = last_date + timedelta(days=1)
-            pred_price = result['predicted_price']
-            lower_b = result['confidence_interval_lower']
-            upper_b = result['confidence_interval_upper']
+            forecast_key = (result['predicted_price'], result['confidence_interval_lower'],
+                            result['confidence_interval_upper'])
+        cache_key = ("price_plot", ticker, data_watermark(DATA_DIR, ticker), forecast_key)
+
+        def build_figure():
+            fig = go.Figure()
             fig.add_trace(
-                go.Scatter(x=[forecast_date], y=[pred_price], mode='markers', marker=dict(color='red', size=10),
-                           name='Forecast'))
-            fig.add_trace(go.Scatter(
-                x=[last_date, forecast_date, forecast_date, last_date],
-                y=[df['Close'].iloc[-1], lower_b, upper_b, df['Close'].iloc[-1]],
-                fill="toself",
-                fillcolor="rgba(255,0,0,0.2)",
-                line=dict(color="rgba(255,255,255,0)"),
-                hoverinfo="skip",
-                showlegend=False,
-                name='Confidence Interval'
-            ))
-        fig.update_layout(title=f"Historical Close Price for {input.forecast_crypto_select()}", xaxis_title="Date",
-                          yaxis_title="Price (USD)")
-        return ui.HTML(fig.to_html(full_html=False, include_plotlyjs='cdn'))
+                go.Scatter(x=df['Date'], y=df['Close'], mode='lines', name='Close Price', line=dict(color='#007bff')))
+            if result and "predicted_price" in result:
+                last_date = df['Date'].iloc[-1]
+                forecast_date = last_date + timedelta(days=1)
+                pred_price = result['predicted_price']
+                lower_b = result['confidence_interval_lower']
+                upper_b = result['confidence_interval_upper']
+                fig.add_trace(
+                    go.Scatter(x=[forecast_date], y=[pred_price], mode='markers', marker=dict(color='red', size=10),
+                               name='Forecast'))
+                fig.add_trace(go.Scatter(
+                    x=[last_date, forecast_date, forecast_date, last_date],
+                    y=[df['Close'].iloc[-1], lower_b, upper_b, df['Close'].iloc[-1]],
+                    fill="toself",
+                    fillcolor="rgba(255,0,0,0.2)",
+                    line=dict(color="rgba(255,255,255,0)"),
+                    hoverinfo="skip",
+                    showlegend=False,
+                    name='Confidence Interval'
+                ))
+            fig.update_layout(title=f"Historical Close Price for {ticker}", xaxis_title="Date",
+                              yaxis_title="Price (USD)")
+            return fig.to_html(full_html=False, include_plotlyjs='cdn')
+
+        return ui.HTML(render_cache.get_or_render(cache_key, build_figure))
 
     @output
     @render.ui
@@ -198,13 +243,12 @@ def server(input, output, session: Session):
     # --- CORRELATION ANALYSIS LOGIC ---
     @reactive.Calc
     def calculate_correlation():
-        from plotnine import ggplot, aes, geom_tile, geom_text, scale_fill_gradient2, labs, theme_minimal
         tickers = input.corr_crypto_select()
         timeframe = input.corr_timeframe()
         req(tickers and len(tickers) >= 2)
         days = int(timeframe[:-1])
         start_date_dt = date.today() - timedelta(days=days)
-        log_returns_df = pd.DataFrame()
+        log_returns = {}
 
         app_script_dir = os.path.dirname(os.path.abspath(__file__))
 
@@ -214,25 +258,87 @@ def server(input, output, session: Session):
                 df_read = pd.read_csv(file_path, index_col='Date', parse_dates=True)
                 # Ensure index is DatetimeIndex for comparison
                 df_filtered = df_read[df_read.index >= pd.to_datetime(start_date_dt)]
-                log_returns_df[ticker] = df_filtered['Log_Return']
+                log_returns[ticker] = df_filtered['Log_Return']
             except FileNotFoundError:
                 continue
-        return log_returns_df.corr()
+        if not log_returns:
+            return pd.DataFrame()
+        return pd.concat(log_returns, axis=1).corr()
+
+    @reactive.Calc
+    def ordered_correlation():
+        # Clustering runs once per matrix; toggling it off keeps the selection order
+        corr_matrix = calculate_correlation()
+        if corr_matrix.empty or not input.corr_cluster():
+            return corr_matrix
+        order = cluster_order(corr_matrix)
+        return corr_matrix.loc[order, order]
 
     @output
-    @render.plot
+    @render.ui
     def correlation_heatmap():
-        from plotnine import ggplot, aes, geom_tile, geom_text, scale_fill_gradient2, labs, theme_minimal
-        corr_matrix = calculate_correlation()
-        req(corr_matrix is not None and not corr_matrix.empty)
-        corr_melted = corr_matrix.reset_index().melt(id_vars='index')
-        corr_melted.columns = ['Var1', 'Var2', 'value']
-        heatmap = (ggplot(corr_melted, aes(x='Var1', y='Var2', fill='value')) + geom_tile(
-            aes(width=0.95, height=0.95)) + geom_text(aes(label='round(value, 2)'), size=10) + scale_fill_gradient2(
-            low="red", mid="white", high="blue", limits=(-1, 1)) + labs(
-            title=f"Log Return Correlation ({input.corr_timeframe()})", x="", y="",
-            fill="Correlation") + theme_minimal())
-        return heatmap
+        tickers = tuple(input.corr_crypto_select())
+        timeframe = input.corr_timeframe()
+        req(len(tickers) >= 2)
+        cluster = input.corr_cluster()
+        # The timeframe window is anchored on today, so the date is part of the key
+        cache_key = ("correlation_heatmap", tickers, timeframe, cluster, date.today(),
+                     tuple(data_watermark(DATA_DIR, t) for t in tickers))
+
+        def build_figure():
+            corr_matrix = ordered_correlation()
+            req(corr_matrix is not None and not corr_matrix.empty)
+            labels = list(corr_matrix.columns)
+            n = len(labels)
+            show_values = n <= HEATMAP_LABEL_MAX_TICKERS
+            fig = go.Figure(go.Heatmap(
+                z=corr_matrix.to_numpy().round(3),
+                x=labels,
+                y=labels,
+                zmin=-1, zmid=0, zmax=1,
+                colorscale="RdBu",
+                colorbar=dict(title="Correlation"),
+                texttemplate="%{z:.2f}" if show_values else None,
+                hovertemplate="%{y} / %{x}<br>Correlation: %{z:.2f}<extra></extra>",
+                xgap=1 if show_values else 0,
+                ygap=1 if show_values else 0,
+            ))
+            tick_size = 12 if n <= 30 else max(6, int(360 / n))
+            fig.update_layout(
+                title=f"Log Return Correlation ({timeframe})",
+                height=min(max(450, n * 10), 1000),
+                xaxis=dict(tickfont=dict(size=tick_size), showticklabels=n <= HEATMAP_TICK_MAX_TICKERS),
+                yaxis=dict(tickfont=dict(size=tick_size), showticklabels=n <= HEATMAP_TICK_MAX_TICKERS,
+                           autorange="reversed"),
+                plot_bgcolor="white",
+            )
+            return fig.to_html(full_html=False, include_plotlyjs='cdn')
+
+        return ui.HTML(render_cache.get_or_render(cache_key, build_figure))
+
+    # --- SCREENER LOGIC ---
+    @reactive.Calc
+    def load_screener_data():
+        available_tickers.get()  # Re-read whenever a ticker is added
+        app_script_dir = os.path.dirname(os.path.abspath(__file__))
+        return load_all_analytics(os.path.join(app_script_dir, 'data'))
+
+    @output
+    @render.data_frame
+    def screener_table():
+        stats = load_screener_data()
+        req(not stats.empty)
+        columns = {
+            'ticker': 'Ticker', 'last_date': 'As Of', 'last_close': 'Close',
+            'return_7d': '7D Return (%)', 'return_30d': '30D Return (%)', 'return_90d': '90D Return (%)',
+            'volatility_30d': '30D Volatility (%)', 'volatility_annualized': 'Annualized Volatility (%)',
+            'max_drawdown': 'Max Drawdown (%)', 'current_drawdown': 'Current Drawdown (%)',
+        }
+        table = stats.reindex(columns=list(columns)).rename(columns=columns)
+        percent_cols = [c for c in table.columns if c.endswith('(%)')]
+        table[percent_cols] = (table[percent_cols] * 100).round(2)
+        table['Close'] = table['Close'].round(4)
+        return render.DataGrid(table, filters=True)
 
     # --- ADD NEW TICKER LOGIC ---
     status_message = reactive.Value("")
@@ -0,0 +1,59 @@
+import os
+import threading
+from collections import OrderedDict
+
+# Upper bound on the total size of cached figures shared by all sessions
+RENDER_CACHE_MAX_BYTES = int(os.environ.get("RENDER_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+
+
+class RenderCache:
+    """
+    Process-wide LRU cache of rendered figure output (HTML strings or PNG bytes).
+    Entries are evicted least-recently-used first once max_bytes is exceeded.
+    """
+
+    def __init__(self, max_bytes=RENDER_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def put(self, key, value):
+        size = len(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self.current_bytes -= len(self._entries.pop(key))
+            self._entries[key] = value
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.current_bytes -= len(evicted)
+
+    def get_or_render(self, key, render_fn):
+        """
+        Returns the cached output for key, calling render_fn() to build it on a miss.
+        """
+        value = self.get(key)
+        if value is None:
+            value = render_fn()
+            self.put(key, value)
+        return value
+
+
+def data_watermark(data_dir, ticker):
+    """
+    Cheap version stamp for a ticker's data file; changes whenever the CSV is rewritten.
+    """
+    try:
+        return os.stat(os.path.join(data_dir, f"{ticker}.csv")).st_mtime_ns
+    except OSError:
+        return None